@@ -1,4 +1,5 @@
 import configparser
+import functools
 import os
 
 from catkit.catkit_types import Pointer
@@ -42,3 +43,53 @@ def load_config_ini(config_filename):
 
     CONFIG_INI.point_to(config)
     return config
+
+
+def config_cache(maxsize=128):
+    """ Decorator like `functools.lru_cache` for functions whose results are derived from CONFIG_INI.
+
+    The cache is cleared whenever CONFIG_INI is found to point to a different config than the one its entries were
+    computed from, i.e., after `load_config_ini()` or any direct `CONFIG_INI.point_to()`. Code that mutates the
+    current config in place should call `cache_clear()` on the decorated function itself.
+
+    :param maxsize: int, None (optional) - Passed to `functools.lru_cache`.
+    """
+    def decorator(func):
+        cached_func = functools.lru_cache(maxsize=maxsize)(func)
+        # NOTE: Holding a reference to the config (rather than its id()) ensures it can't be mistaken for a new one.
+        cached_config = [None]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            config = CONFIG_INI.self
+            if config is not cached_config[0]:
+                cached_func.cache_clear()
+                cached_config[0] = config
+            return cached_func(*args, **kwargs)
+
+        wrapper.cache_clear = cached_func.cache_clear
+        wrapper.cache_info = cached_func.cache_info
+        return wrapper
+
+    return decorator
+
+
+@config_cache(maxsize=None)
+def cached_get(section, key, cast=str):
+    """ Memoized CONFIG_INI lookup for values read repeatedly at runtime. See `config_cache()` for invalidation.
+
+    :param section: str - Config section name.
+    :param key: str - Option name within section.
+    :param cast: type (optional) - One of str, int, float, or bool. Determines which ConfigParser getter is used.
+    :return: The parsed value.
+    """
+    if cast is str:
+        return CONFIG_INI.get(section, key)
+    elif cast is int:
+        return CONFIG_INI.getint(section, key)
+    elif cast is float:
+        return CONFIG_INI.getfloat(section, key)
+    elif cast is bool:
+        return CONFIG_INI.getboolean(section, key)
+    else:
+        raise TypeError(f"Expected cast to be one of (str, int, float, bool) but got '{cast}'")
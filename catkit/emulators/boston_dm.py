@@ -113,7 +113,7 @@ class PoppyBmcEmulator:
         np.clip(full_dm_command, a_min=0, a_max=1, out=full_dm_command)
 
         if self._dac_bit_width:
-            self.log.info(f"Simulating DM quantization with {self._dac_bit_width}b DAC")
+            self.log.info("Simulating DM quantization with %sb DAC", self._dac_bit_width)
 
             quantization_step_size = 1.0/(2**self._dac_bit_width - 1)
             full_dm_command = quantization_step_size * np.round(full_dm_command / quantization_step_size)
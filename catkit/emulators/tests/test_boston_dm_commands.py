@@ -0,0 +1,114 @@
+import copy
+import os
+
+import numpy as np
+import pytest
+
+import catkit.config
+from catkit.catkit_types import quantity, units, SinSpecification
+from catkit.hardware.boston import commands, sin_command, DmCommand
+import catkit.util
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+class TestAssembleSin:
+    angle = 30
+    ncycles = 8
+
+    def test_matches_sin_command(self):
+        sin_basis = sin_command.precompute_sin_basis(self.angle, self.ncycles)
+        peak_to_valley = quantity(np.array([10, 20, 30, 40]), units.nanometer)
+        phase = np.array([0, 45, 90, 180])
+
+        sin_waves = sin_command.assemble_sin(sin_basis, peak_to_valley, phase)
+        assert sin_waves.shape == (4, 34, 34)
+
+        for sin_wave, p2v, ph in zip(sin_waves, peak_to_valley, phase):
+            expected = sin_command.sin_command(SinSpecification(self.angle, self.ncycles, p2v, ph)).data
+            np.testing.assert_allclose(sin_wave, expected, rtol=0, atol=1e-20)
+
+    def test_scalar(self):
+        sin_basis = sin_command.precompute_sin_basis(self.angle, self.ncycles)
+        peak_to_valley = quantity(10, units.nanometer)
+        initial_data = np.ones((34, 34))
+
+        sin_wave = sin_command.assemble_sin(sin_basis, peak_to_valley, 45, initial_data=initial_data)
+        assert sin_wave.shape == (34, 34)
+
+        expected = sin_command.sin_command(SinSpecification(self.angle, self.ncycles, peak_to_valley, 45),
+                                           initial_data=initial_data).data
+        np.testing.assert_allclose(sin_wave, expected, rtol=0, atol=1e-20)
+
+    def test_sampling(self):
+        with pytest.raises(ValueError):
+            sin_command.precompute_sin_basis(self.angle, 18)
+
+        sin_basis = sin_command.precompute_sin_basis(self.angle, 17)
+        peak_to_valley = quantity(10, units.nanometer)
+        sin_command.assemble_sin(sin_basis, peak_to_valley, 90)
+
+        with pytest.raises(ValueError):
+            sin_command.assemble_sin(sin_basis, peak_to_valley, 0)
+
+        with pytest.raises(ValueError):
+            sin_command.assemble_sin(sin_basis, peak_to_valley, np.array([90, 0]))
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+class TestFlatCommand:
+    def test_mutation_does_not_leak(self):
+        dm_command = commands.flat_command(dm_num=1)
+        dm_command.data += 1
+        dm_command.sin_specification.append(SinSpecification(0, 1, quantity(1, units.nanometer), 0))
+
+        new_dm_command = commands.flat_command(dm_num=1)
+        assert new_dm_command is not dm_command
+        assert not np.any(new_dm_command.data)
+        assert new_dm_command.sin_specification == []
+
+    def test_args(self):
+        assert commands.flat_command(dm_num=2).dm_num == 2
+        assert commands.flat_command(bias=True, dm_num=1).bias
+
+        dm_command, short_name = commands.flat_command(bias=True, return_shortname=True)
+        assert short_name == "flat_bias"
+
+    def test_follows_config(self):
+        assert commands.flat_command().data.shape == (34, 34)
+
+        previous_config = catkit.config.CONFIG_INI.self
+        config = copy.deepcopy(previous_config)
+        config.set("boston_kilo952", "dm_length_actuators", "2")
+        catkit.config.CONFIG_INI.point_to(config)
+        try:
+            assert commands.flat_command().data.shape == (2, 2)
+        finally:
+            catkit.config.CONFIG_INI.point_to(previous_config)
+
+        assert commands.flat_command().data.shape == (34, 34)
+
+
+@pytest.mark.usefixtures("dummy_config_ini")
+class TestLoadDmCommand:
+    def test_reread_when_rewritten(self, tmpdir):
+        path = os.path.join(tmpdir, "dm_command_2d_noflat.fits")
+        data = np.random.rand(34, 34)
+        catkit.util.write_fits(data, path)
+        np.testing.assert_array_equal(DmCommand.load_dm_command(path, as_volts=True).data, data)
+
+        # Rewrite with the same modification time, such that only the size of the file has changed.
+        mtime_ns = os.stat(path).st_mtime_ns
+        new_data = np.random.rand(34, 34).astype(np.float32)
+        catkit.util.write_fits(new_data, path)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        np.testing.assert_array_equal(DmCommand.load_dm_command(path, as_volts=True).data, new_data)
+
+    def test_data_not_shared(self, tmpdir):
+        path = os.path.join(tmpdir, "dm_command_2d_noflat.fits")
+        data = np.random.rand(34, 34)
+        catkit.util.write_fits(data, path)
+
+        dm_command = DmCommand.load_dm_command(path, as_volts=True)
+        dm_command.data += 1
+
+        np.testing.assert_array_equal(DmCommand.load_dm_command(path, as_volts=True).data, data)
@@ -0,0 +1,475 @@
+import configparser
+import ctypes
+import sys
+import time
+from types import ModuleType
+from unittest import mock
+
+import pytest
+
+import catkit.config
+from catkit.hardware.standa import stages
+from catkit.hardware.standa.stages import LatencyMode, Stage, Unit
+
+
+MOVING = 129
+STOPPED = 0
+
+
+class get_position_t(ctypes.Structure):
+    _fields_ = [("Position", ctypes.c_int), ("uPosition", ctypes.c_int), ("EncPosition", ctypes.c_longlong)]
+
+
+class status_t(ctypes.Structure):
+    _fields_ = [("MvCmdSts", ctypes.c_uint)]
+
+
+class move_settings_t(ctypes.Structure):
+    _fields_ = [("Speed", ctypes.c_uint), ("uSpeed", ctypes.c_uint)]
+
+
+class home_settings_t(ctypes.Structure):
+    _fields_ = [("HomeDelta", ctypes.c_int), ("uHomeDelta", ctypes.c_int)]
+
+
+class controller_name_t(ctypes.Structure):
+    _fields_ = [("ControllerName", ctypes.c_char * 17)]
+
+
+class FakeXimcLib:
+    """ Just enough of pyximc.lib to drive a Stage, recording what was called. """
+
+    def __init__(self):
+        self.calls = []
+        self.status_times = []
+        self.devices = [b"xi-com:///dev/ttyACM0", b"xi-com:///dev/ttyACM1"]
+        self.open_results = []  # Returned by open_device() in turn, then 1 once exhausted.
+        self.moving = False
+        self.moving_polls = 0  # Report moving for this many get_status() calls, then fall back to self.moving.
+        self.home_settings = None
+        self.position = 0  # In steps, returned by get_position().
+        self.targets = []  # (position, u_position) of each command_move().
+
+    def enumerate_devices(self, flags, hints):
+        self.calls.append("enumerate_devices")
+        return list(self.devices)
+
+    def get_device_count(self, devenum):
+        return len(devenum)
+
+    def get_device_name(self, devenum, index):
+        return devenum[index]
+
+    def get_enumerate_device_controller_name(self, devenum, index, ref):
+        return 0
+
+    def open_device(self, device_id):
+        self.calls.append("open_device")
+        return ctypes.c_int(self.open_results.pop(0) if self.open_results else 1)
+
+    def close_device(self, ref):
+        return 0
+
+    def command_move(self, instrument, position, u_position):
+        self.calls.append("command_move")
+        self.targets.append((position, u_position))
+        return 0
+
+    def command_sstp(self, instrument):
+        self.calls.append("command_sstp")
+        return 0
+
+    def command_homezero(self, instrument):
+        self.calls.append("command_homezero")
+        return 0
+
+    def get_status(self, instrument, ref):
+        self.calls.append("get_status")
+        self.status_times.append(time.monotonic())
+        moving = self.moving or self.moving_polls > 0
+        self.moving_polls -= 1
+        ref._obj.MvCmdSts = MOVING if moving else STOPPED
+        return 0
+
+    def get_position(self, instrument, ref):
+        self.calls.append("get_position")
+        ref._obj.Position = int(self.position)
+        ref._obj.uPosition = round((self.position - int(self.position)) * 256)
+        ref._obj.EncPosition = int(self.position)
+        return 0
+
+    def get_home_settings(self, instrument, ref):
+        return 0
+
+    def set_home_settings(self, instrument, ref):
+        self.home_settings = (ref._obj.HomeDelta, ref._obj.uHomeDelta)
+        return 0
+
+    def get_move_settings(self, instrument, ref):
+        return 0
+
+    def set_move_settings(self, instrument, ref):
+        return 0
+
+
+@pytest.fixture()
+def pyximc(monkeypatch):
+    """ Inject a fake pyximc module for Stage to (lazily) import. """
+    module = ModuleType("pyximc")
+    module.lib = FakeXimcLib()
+    module.Result = type("Result", (), {"Ok": 0})
+    module.EnumerateFlags = type("EnumerateFlags", (), {"ENUMERATE_PROBE": 1})
+    for struct in (get_position_t, status_t, move_settings_t, home_settings_t, controller_name_t):
+        setattr(module, struct.__name__, struct)
+
+    monkeypatch.setitem(sys.modules, "pyximc", module)
+    stages._get_pyximc.cache_clear()
+    Stage.invalidate_device_cache()
+    yield module
+    stages._get_pyximc.cache_clear()
+    Stage.invalidate_device_cache()
+
+
+@pytest.fixture()
+def stage_config():
+    """ Point CONFIG_INI at a config with a section for the stage, restoring the previous config afterwards. """
+    previous_config = catkit.config.CONFIG_INI.self
+    config = configparser.ConfigParser()
+    config.add_section("dummy_stage")
+    catkit.config.CONFIG_INI.point_to(config)
+    yield config
+    catkit.config.CONFIG_INI.point_to(previous_config)
+
+
+def make_stage(**kwargs):
+    kwargs = {**dict(config_id="dummy_stage", device_name="ttyACM0", softStops=(0, 1000), homeOffset=0,
+                     conversionFactor=1, units=Unit.STEPS), **kwargs}
+    return Stage(**kwargs)
+
+
+@pytest.mark.parametrize(("value", "expected"), [(0, (0, 0)),
+                                                 (2.5, (2, 128)),
+                                                 (-2.5, (-2, -128)),
+                                                 (0.99999999, (1, 0)),
+                                                 (1/256, (0, 1)),
+                                                 (-1/256, (0, -1)),
+                                                 (255.999, (256, 0)),
+                                                 (10, (10, 0))])
+def test_split_q8(value, expected):
+    assert stages._split_q8(value) == expected
+
+
+@pytest.mark.parametrize(("home_offset", "expected"), [(0, (0, 0)),
+                                                       (12.5, (12, 128)),
+                                                       (-3.25, (-3, -64))])
+def test_home_offset(pyximc, home_offset, expected):
+    with make_stage(homeOffset=home_offset) as stage:
+        stage.home()
+    assert pyximc.lib.home_settings == expected
+
+
+def test_device_enumeration_cached_across_instances(pyximc):
+    make_stage()
+    make_stage(device_name="ttyACM1")
+    assert pyximc.lib.calls.count("enumerate_devices") == 1
+
+
+def test_device_enumeration_expires(pyximc, monkeypatch):
+    make_stage()
+    monkeypatch.setattr(Stage, "_enum_cache_ts", Stage._enum_cache_ts - Stage.DEVICE_ENUMERATION_MAX_AGE)
+    make_stage()
+    assert pyximc.lib.calls.count("enumerate_devices") == 2
+
+
+def test_empty_device_enumeration_not_cached(pyximc):
+    pyximc.lib.devices = []
+    with pytest.raises(RuntimeError, match="No devices found"):
+        make_stage()
+
+    pyximc.lib.devices = [b"xi-com:///dev/ttyACM0"]
+    assert make_stage().deviceID == b"xi-com:///dev/ttyACM0"
+    assert pyximc.lib.calls.count("enumerate_devices") == 2
+
+
+def test_open_retries_with_fresh_device_list(pyximc):
+    stage = make_stage()
+    pyximc.lib.open_results = [-1]
+    with stage:
+        assert stage.instrument.value == 1
+    assert pyximc.lib.calls == ["enumerate_devices", "open_device", "enumerate_devices", "open_device"]
+
+
+def test_open_raises_after_retry(pyximc):
+    stage = make_stage()
+    pyximc.lib.open_results = [-1, -1]
+    with pytest.raises(RuntimeError, match="Failed to open"):
+        with stage:
+            pass
+    assert pyximc.lib.calls.count("open_device") == 2
+
+
+def test_await_stop_backoff(pyximc):
+    pyximc.lib.moving_polls = 4
+    sleeps = []
+    with make_stage(poll_interval=0.01) as stage:
+        with mock.patch("time.sleep", side_effect=sleeps.append):
+            assert stage.await_stop(backoff=2, max_poll_interval=0.05) is False
+    assert pyximc.lib.calls.count("get_status") == 5
+    assert sleeps == pytest.approx([0.01, 0.02, 0.04, 0.05])
+
+
+def test_await_stop_poll_interval_not_capped(pyximc):
+    pyximc.lib.moving_polls = 3
+    sleeps = []
+    with make_stage() as stage:
+        assert stage.max_poll_interval < 0.5
+        with mock.patch("time.sleep", side_effect=sleeps.append):
+            assert stage.await_stop(poll_interval=0.5) is False
+    assert sleeps == pytest.approx([0.5, 0.5, 0.5])
+
+
+def test_await_stop_timeout(pyximc):
+    pyximc.lib.moving = True
+    with make_stage() as stage:
+        with pytest.raises(TimeoutError):
+            stage.await_stop(timeout=0.05, poll_interval=0.01)
+
+
+@pytest.mark.parametrize(("value", "expected"), [(LatencyMode.SAFE, LatencyMode.SAFE),
+                                                 ("low", LatencyMode.LOW),
+                                                 ("Balanced", LatencyMode.BALANCED),
+                                                 ("SAFE", LatencyMode.SAFE)])
+def test_latency_mode_from_str(value, expected):
+    assert LatencyMode(value) is expected
+
+
+def test_latency_mode_invalid():
+    with pytest.raises(ValueError):
+        LatencyMode("fast")
+
+
+def test_latency_defaults(pyximc, stage_config):
+    stage = make_stage()
+    assert stage.latency_mode is LatencyMode.LOW
+    assert stage.poll_interval == LatencyMode.LOW.poll_interval
+    assert stage.max_poll_interval == LatencyMode.LOW.max_poll_interval
+    assert stage.stop_timeout == LatencyMode.LOW.timeout
+
+
+def test_latency_from_config(pyximc, stage_config):
+    stage_config.set("dummy_stage", "latency_mode", "Safe")
+    stage = make_stage()
+    assert stage.latency_mode is LatencyMode.SAFE
+    assert stage.poll_interval == LatencyMode.SAFE.poll_interval
+    assert stage.stop_timeout == LatencyMode.SAFE.timeout
+
+    stage_config.set("dummy_stage", "poll_interval_s", "2")
+    stage_config.set("dummy_stage", "stop_timeout_s", "5")
+    stage = make_stage()
+    assert stage.poll_interval == 2
+    assert stage.max_poll_interval == 2  # Never less than poll_interval.
+    assert stage.stop_timeout == 5
+
+
+def test_latency_kwargs_override_config(pyximc, stage_config):
+    stage_config.set("dummy_stage", "latency_mode", "safe")
+    stage_config.set("dummy_stage", "poll_interval_s", "2")
+    stage_config.set("dummy_stage", "stop_timeout_s", "5")
+
+    stage = make_stage(latency_mode="balanced", poll_interval=0.02, stop_timeout=3)
+    assert stage.latency_mode is LatencyMode.BALANCED
+    assert stage.poll_interval == 0.02
+    assert stage.max_poll_interval == LatencyMode.BALANCED.max_poll_interval
+    assert stage.stop_timeout == 3
+
+
+def test_latency_without_config(pyximc):
+    previous_config = catkit.config.CONFIG_INI.self
+    catkit.config.CONFIG_INI.point_to(None)
+    try:
+        assert make_stage().latency_mode is LatencyMode.LOW
+    finally:
+        catkit.config.CONFIG_INI.point_to(previous_config)
+
+
+def test_await_stop_default_timeout(pyximc):
+    pyximc.lib.moving = True
+    with make_stage(stop_timeout=0.05, poll_interval=0.01) as stage:
+        with pytest.raises(TimeoutError):
+            stage.await_stop()
+
+
+def test_await_stop_skips_query_once_stopped(pyximc):
+    with make_stage() as stage:
+        stage.await_stop()
+        assert pyximc.lib.calls.count("get_status") == 1
+
+        # Nothing has moved the stage since it was seen to stop.
+        stage.await_stop()
+        assert not stage.is_moving()  # is_moving() always queries.
+        stage.await_stop()
+        assert pyximc.lib.calls.count("get_status") == 2
+
+
+@pytest.mark.parametrize("command", [lambda stage: stage.goto_steps(10, wait=False),
+                                     lambda stage: stage.stop(),
+                                     lambda stage: stage.home()])
+def test_commands_reset_known_stopped(pyximc, command):
+    with make_stage() as stage:
+        stage.await_stop()
+        command(stage)
+        stage.await_stop()
+    assert pyximc.lib.calls.count("get_status") == 2
+
+
+def test_open_resets_known_stopped(pyximc):
+    stage = make_stage()
+    with stage:
+        stage.await_stop()
+
+    # The stage may have been moved by someone else whilst closed.
+    with stage:
+        stage.await_stop()
+    assert pyximc.lib.calls.count("get_status") == 2
+
+
+def test_is_moving_within_move_status_delay(pyximc, monkeypatch):
+    monkeypatch.setattr(Stage, "MOVE_STATUS_DELAY", 10)
+    with make_stage() as stage:
+        stage.goto_steps(10, wait=False)
+        assert stage.is_moving()
+    assert "get_status" not in pyximc.lib.calls
+
+
+def test_await_stop_waits_out_move_status_delay(pyximc, monkeypatch):
+    monkeypatch.setattr(Stage, "MOVE_STATUS_DELAY", 0.05)
+    with make_stage() as stage:
+        stage.goto_steps(10, wait=False)
+        stage.await_stop()
+        assert pyximc.lib.status_times[0] >= stage._move_ts + Stage.MOVE_STATUS_DELAY
+
+
+@pytest.fixture()
+def position_max_age(monkeypatch):
+    """ Make the position cache outlive the test, such that only invalidation (not timing) re-queries. """
+    monkeypatch.setattr(Stage, "POSITION_MAX_AGE", 10)
+
+
+def test_position_accessors_share_read(pyximc, position_max_age):
+    pyximc.lib.position = 12.5
+    with make_stage(conversionFactor=2) as stage:
+        assert stage.get_step_position() == 12.5
+        assert stage.get_enc_position() == 12
+        assert stage.get_position() == 24
+    assert pyximc.lib.calls.count("get_position") == 1
+
+
+def test_position_expires(pyximc, position_max_age):
+    with make_stage() as stage:
+        stage.get_step_position()
+        stage._pos_ts -= Stage.POSITION_MAX_AGE
+        stage.get_step_position()
+    assert pyximc.lib.calls.count("get_position") == 2
+
+
+@pytest.mark.parametrize("command", [lambda stage: stage.goto_steps(100, wait=False),
+                                     lambda stage: stage.stop(),
+                                     lambda stage: stage.home()])
+def test_commands_invalidate_position(pyximc, position_max_age, command):
+    with make_stage() as stage:
+        assert stage.get_step_position() == 0
+        pyximc.lib.position = 100
+        command(stage)
+        assert stage.get_step_position() == 100
+    assert pyximc.lib.calls.count("get_position") == 2
+
+
+def test_position_after_await_stop(pyximc, position_max_age, monkeypatch):
+    monkeypatch.setattr(Stage, "MOVE_STATUS_DELAY", 0)
+    with make_stage(poll_interval=0.001) as stage:
+        pyximc.lib.moving = True
+        stage.goto_steps(100, wait=False)
+        pyximc.lib.position = 50
+        assert stage.get_step_position() == 50
+
+        # Arrive.
+        pyximc.lib.moving = False
+        pyximc.lib.position = 100
+        stage.await_stop()
+        assert stage.get_step_position() == 100
+
+
+def test_position_after_is_moving(pyximc, position_max_age, monkeypatch):
+    monkeypatch.setattr(Stage, "MOVE_STATUS_DELAY", 0)
+    with make_stage() as stage:
+        pyximc.lib.moving = True
+        stage.goto_steps(100, wait=False)
+        pyximc.lib.position = 50
+        assert stage.get_step_position() == 50
+
+        pyximc.lib.position = 75
+        assert stage.is_moving()
+        assert stage.get_step_position() == 75
+
+        pyximc.lib.moving = False
+        pyximc.lib.position = 100
+        assert not stage.is_moving()
+        assert stage.get_step_position() == 100
+
+
+@pytest.fixture()
+def no_sleep(monkeypatch):
+    """ Record, rather than wait out, every sleep. """
+    monkeypatch.setattr(Stage, "MOVE_STATUS_DELAY", 0)
+    sleeps = []
+    with mock.patch("time.sleep", side_effect=sleeps.append):
+        yield sleeps
+
+
+def test_queue_move_when_stopped(pyximc, no_sleep):
+    with make_stage() as stage:
+        # The stage may still be moving from before it was opened, so this needs a single status query.
+        stage.queue_move(10)
+        assert pyximc.lib.calls == ["enumerate_devices", "open_device", "get_status", "command_move"]
+
+        stage.await_stop()
+        del pyximc.lib.calls[:]
+
+        stage.queue_move(20)
+        assert pyximc.lib.calls == ["command_move"]
+    assert pyximc.lib.targets == [(10, 0), (20, 0)]
+    assert not no_sleep
+
+
+def test_queue_move_waits_for_prior_move(pyximc, no_sleep):
+    with make_stage() as stage:
+        stage.queue_move(10)
+        del pyximc.lib.calls[:]
+
+        # The first move is still in progress, so a new command_move() would retarget it.
+        pyximc.lib.moving_polls = 3
+        stage.queue_move(20)
+    assert pyximc.lib.calls == ["get_status"] * 4 + ["command_move"]
+    assert pyximc.lib.targets == [(10, 0), (20, 0)]
+    assert len(no_sleep) == 3
+
+
+def test_drain(pyximc, no_sleep):
+    with make_stage() as stage:
+        stage.queue_move(10)
+        del pyximc.lib.calls[:]
+
+        pyximc.lib.moving_polls = 2
+        assert stage.drain() is False
+        assert pyximc.lib.calls == ["get_status"] * 3
+
+        # Nothing more to wait for.
+        stage.drain()
+        assert pyximc.lib.calls == ["get_status"] * 3
+
+
+def test_queue_move_real_units(pyximc, no_sleep):
+    with make_stage(conversionFactor=0.5, units=Unit.REAL) as stage:
+        stage.queue_move(10, units=Unit.REAL)
+        stage.queue_move(10)
+    assert pyximc.lib.targets == [(20, 0), (10, 0)]
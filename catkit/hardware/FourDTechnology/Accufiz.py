@@ -7,7 +7,6 @@ import shutil
 import uuid
 
 from astropy.io import fits
-from glob import glob
 import numpy as np
 from scipy import ndimage
 
@@ -98,10 +97,10 @@ class Accufiz(FizeauInterferometer):
         # Send request to save data.
         self.post(f"{self.html_prefix}/SaveMeasurement", data={"fileName": server_file_path})
 
-        if not glob(f"{local_file_path}.h5"):
+        if not os.path.isfile(f"{local_file_path}.h5"):
             raise RuntimeError(f"{self.config_id}: Failed to save measurement data to '{local_file_path}'.")
 
-        self.log.info(f"{self.config_id}: Succeeded to save measurement data to '{local_file_path}'")
+        self.log.info("%s: Succeeded to save measurement data to '%s'", self.config_id, local_file_path)
 
         fits_local_file_path, fits_hdu = self.convert_h5_to_fits(local_file_path, rotate, fliplr)
 
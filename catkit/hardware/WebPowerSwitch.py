@@ -18,7 +18,7 @@ class WebPowerSwitch(RemotePowerSwitch):
 
     instrument_lib = requests
 
-    def initialize(self, user=None, password=None, ip=None, outlet_list={}):
+    def initialize(self, user=None, password=None, ip=None, outlet_list=None):
         self.log = logging.getLogger()
 
         # Given the specificity of the script numbering I'm not sure that it really makes sense
@@ -27,7 +27,7 @@ class WebPowerSwitch(RemotePowerSwitch):
         self.password = CONFIG_INI.get(self.config_id, "password") if password is None else password
         self.ip = CONFIG_INI.get(self.config_id, "ip") if ip is None else ip
 
-        self.outlet_list = outlet_list
+        self.outlet_list = {} if outlet_list is None else outlet_list
 
         # Obtain only from config for simplicity.
         self.all_off_id = CONFIG_INI.getint(self.config_id, "all_off")
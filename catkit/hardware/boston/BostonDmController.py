@@ -54,7 +54,7 @@ class BostonDmController(DeformableMirrorController):
         data_min = np.min(data)
         data_max = np.max(data)
         if data_min < 0 or data_max > 1:
-            self.log.warning(f"DM command out of range and will be clipped by hardware. min:{data_min}, max:{data_max}")
+            self.log.warning("DM command out of range and will be clipped by hardware. min:%s, max:%s", data_min, data_max)
 
         status = self.instrument.send_data(data)
         if status != self.instrument_lib.NO_ERR:
@@ -151,7 +151,7 @@ class BostonDmController(DeformableMirrorController):
                 if channel is None:
                     self.log.info("Applying shape to both DMs")
                 else:
-                    self.log.info(f'Applying shape to both DMs in channel {channel}.')
+                    self.log.info('Applying shape to both DMs in channel %s.', channel)
 
             if channel is None:
                 if self.channels:
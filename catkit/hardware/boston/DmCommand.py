@@ -1,11 +1,12 @@
+import datetime
+import functools
 import os
 import time
-import datetime
 
 from astropy.io import fits
 import numpy as np
 
-from catkit.config import CONFIG_INI
+from catkit.config import CONFIG_INI, cached_get
 import catkit.util
 
 
@@ -35,10 +36,7 @@ class DmCommand(object):
 
         """
 
-        calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-        self.calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                                  "hardware",
-                                                  "boston")
+        self.calibration_data_path = get_calibration_data_path()
         self.dm_num = dm_num
         self.flat_map = flat_map
         self.bias = bias
@@ -51,12 +49,12 @@ class DmCommand(object):
             self.sin_specification = sin_specification if isinstance(sin_specification, list) else [sin_specification]
 
         # Load config values once and store as class attributes.
-        self.total_actuators = CONFIG_INI.getint('boston_kilo952', 'number_of_actuators')
-        self.command_length = CONFIG_INI.getint('boston_kilo952', 'command_length')
-        self.pupil_length = CONFIG_INI.getint('boston_kilo952', 'dm_length_actuators')
-        self.max_volts = CONFIG_INI.getint('boston_kilo952', 'max_volts')
-        self.bias_volts_dm1 = CONFIG_INI.getint('boston_kilo952', 'bias_volts_dm1')
-        self.bias_volts_dm2 = CONFIG_INI.getint('boston_kilo952', 'bias_volts_dm2')
+        self.total_actuators = cached_get('boston_kilo952', 'number_of_actuators', int)
+        self.command_length = cached_get('boston_kilo952', 'command_length', int)
+        self.pupil_length = cached_get('boston_kilo952', 'dm_length_actuators', int)
+        self.max_volts = cached_get('boston_kilo952', 'max_volts', int)
+        self.bias_volts_dm1 = cached_get('boston_kilo952', 'bias_volts_dm1', int)
+        self.bias_volts_dm2 = cached_get('boston_kilo952', 'bias_volts_dm2', int)
 
         # Error handling for dm_num.
         if not (dm_num == 1 or dm_num == 2):
@@ -111,20 +109,19 @@ class DmCommand(object):
             elif self.flat_map:
                 dm_command += get_flat_map_volts(self.dm_num)
 
-            # Convert between 0-1.
-            dm_command /= self.max_volts
-
         # Flatten the command using the mask index.
         dm_command = convert_dm_image_to_command(dm_command)
 
-        if self.dm_num == 1:
-            dm_command = np.append(dm_command, np.zeros(self.command_length - dm_command.size))
-        else:
-            zero_buffer = np.zeros(int(self.command_length / 2))
-            dm_command = np.append(zero_buffer, dm_command)
-            dm_command = np.append(dm_command, np.zeros(self.command_length - dm_command.size))
+        # Convert between 0-1. Done after flattening so that only the actuators within the mask are scaled.
+        if not self.as_voltage_percentage:
+            dm_command /= self.max_volts
 
-        return dm_command
+        # Place the actuators into a zero-padded command of the full length; DM2 starts halfway in.
+        offset = 0 if self.dm_num == 1 else int(self.command_length / 2)
+        padded_command = np.zeros(self.command_length)
+        padded_command[offset:offset + dm_command.size] = dm_command
+
+        return padded_command
 
     def save_as_fits(self, filepath):
         """
@@ -177,8 +174,30 @@ def load_dm_command(path, dm_num=1, flat_map=False, bias=False, as_volts=False):
     :param bias: Apply a constant bias to the command.
     :return: DmCommand object representing the dm command fits file.
     """
-    data = fits.getdata(path)
-    return DmCommand(data, dm_num, flat_map=flat_map, bias=bias, as_volts=as_volts)
+    # The parsed file is cached, keyed on its modification time and size such that rewritten files are re-read (the
+    # size guards against coarse mtimes, e.g., on network shares). Each DmCommand gets its own copy of the data.
+    stat = os.stat(path)
+    data = _read_dm_command_fits(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    return DmCommand(data.copy(), dm_num, flat_map=flat_map, bias=bias, as_volts=as_volts)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_dm_command_fits(path, mtime_ns, size):
+    return fits.getdata(path, memmap=False)
+
+
+def get_calibration_data_path():
+    """
+    Get the directory containing the Boston DM calibration files (flat & gain maps).
+    :return: Path to <calibration_data_package>/hardware/boston. This is cached to avoid searching for the package
+             each time.
+    """
+    return _find_calibration_data_path(cached_get("optics_lab", "calibration_data_package"))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_calibration_data_path(calibration_data_package):
+    return os.path.join(catkit.util.find_package_location(calibration_data_package), "hardware", "boston")
 
 
 def get_flat_map_volts(dm_num):
@@ -187,24 +206,19 @@ def get_flat_map_volts(dm_num):
     :param dm_num: Which DM to lead the command for.
     :return: flat map for the selected DM. This function caches the map to avoid multiple disk access.
     """
-    calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-    calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                         "hardware",
-                                         "boston")
-
     global flat_map_dm1, flat_map_dm2
 
     if dm_num == 1:
         if flat_map_dm1 is None:
             fname = CONFIG_INI.get("boston_kilo952", "flat_map_dm1")
-            flat_map_dm1 = fits.getdata(os.path.join(calibration_data_path, fname))
+            flat_map_dm1 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return flat_map_dm1
 
     if dm_num == 2:
         if flat_map_dm2 is None:
             fname = CONFIG_INI.get("boston_kilo952", "flat_map_dm2")
-            flat_map_dm2 = fits.getdata(os.path.join(calibration_data_path, fname))
+            flat_map_dm2 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return flat_map_dm2
 
@@ -217,24 +231,19 @@ def get_m_per_volt_map(dm_num):
     :param dm_num: Which DM to load the command for.
     :return: gain map for the selected DM. This function caches the map to avoid multiple disk access
     """
-    calibration_data_package = CONFIG_INI.get("optics_lab", "calibration_data_package")
-    calibration_data_path = os.path.join(catkit.util.find_package_location(calibration_data_package),
-                                         "hardware",
-                                         "boston")
-
     global m_per_volt_map1, m_per_volt_map2
 
     if dm_num == 1:
         if m_per_volt_map1 is None:
             fname = CONFIG_INI.get("boston_kilo952", "gain_map_dm1")
-            m_per_volt_map1 = fits.getdata(os.path.join(calibration_data_path, fname))
+            m_per_volt_map1 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return m_per_volt_map1
 
     if dm_num == 2:
         if m_per_volt_map2 is None:
             fname = CONFIG_INI.get("boston_kilo952", "gain_map_dm2")
-            m_per_volt_map2 = fits.getdata(os.path.join(calibration_data_path, fname))
+            m_per_volt_map2 = fits.getdata(os.path.join(get_calibration_data_path(), fname))
 
         return m_per_volt_map2
 
@@ -280,18 +289,17 @@ def convert_m_to_volts(data, dm_num, meter_to_volt_map=None):
 
 
 def convert_dm_command_to_image(dm_command):
-    mask = catkit.util.get_dm_mask().astype('bool')
-    number_of_actuators = np.count_nonzero(mask)
+    mask_index = catkit.util.get_dm_mask_index()
 
-    image = np.zeros(mask.shape)
-    image[mask] = dm_command[:number_of_actuators]
+    image = np.zeros(catkit.util.get_dm_mask().shape)
+    image.ravel()[mask_index] = dm_command[:mask_index.size]
 
     return image
 
 
 def convert_dm_image_to_command(dm_image, path_to_save=None):
     # Take actuators corresponding to the DM mask
-    dm_command = dm_image[catkit.util.get_dm_mask().astype('bool')]
+    dm_command = np.ravel(dm_image)[catkit.util.get_dm_mask_index()]
 
     # Write new image as fits file
     if path_to_save is not None:
@@ -1,6 +1,8 @@
+import copy
+
 import numpy as np
 
-from catkit.config import CONFIG_INI
+from catkit.config import CONFIG_INI, cached_get, config_cache
 from catkit.hardware.boston.DmCommand import DmCommand
 from catkit.catkit_types import units, quantity
 
@@ -29,9 +31,11 @@ def flat_command(bias=False,
     if bias:
         short_name += "_bias"
 
-    num_actuators_pupil = CONFIG_INI.getint(config_name, 'dm_length_actuators')
-    zero_array = np.zeros((num_actuators_pupil, num_actuators_pupil))
-    dm_command_object = DmCommand(zero_array, dm_num, flat_map=flat_map, bias=bias)
+    # The command only depends on the args (and config) so is cached. Return a copy so that callers are free to
+    # mutate it without corrupting the cache.
+    dm_command_object = copy.copy(_cached_flat_command(bias, flat_map, dm_num))
+    dm_command_object.data = dm_command_object.data.copy()
+    dm_command_object.sin_specification = list(dm_command_object.sin_specification)
 
     if return_shortname:
         return dm_command_object, short_name
@@ -39,6 +43,13 @@ def flat_command(bias=False,
         return dm_command_object
 
 
+@config_cache(maxsize=8)
+def _cached_flat_command(bias, flat_map, dm_num):
+    num_actuators_pupil = cached_get(config_name, 'dm_length_actuators', int)
+    zero_array = np.zeros((num_actuators_pupil, num_actuators_pupil))
+    return DmCommand(zero_array, dm_num, flat_map=flat_map, bias=bias)
+
+
 def poke_command(actuators, amplitude=quantity(700, units.nanometer), bias=False,
                  flat_map=True, return_shortname=False, dm_num=1):
     """
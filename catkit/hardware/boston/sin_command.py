@@ -1,3 +1,4 @@
+from collections import namedtuple
 import math
 
 import numpy as np
@@ -7,11 +8,14 @@ from skimage.transform import resize
 import catkit.util
 from catkit.hardware.boston.DmCommand import DmCommand
 from catkit.catkit_types import units
-from catkit.config import CONFIG_INI
+from catkit.config import CONFIG_INI, cached_get
 
 
 dm_config_id = "boston_kilo952"
 
+# Named Tuple as a container for the precomputed quadrature components of a 2D sine wave, see precompute_sin_basis().
+SinBasis = namedtuple("SinBasis", "cos_grid, sin_grid, ncycles")
+
 
 def sin_command(sin_specification,
                 dm_num=1,
@@ -36,7 +40,7 @@ def sin_command(sin_specification,
         sin_specification = [sin_specification]
 
     # Create an array of zeros.
-    num_actuators_pupil = CONFIG_INI.getint(dm_config_id, 'dm_length_actuators')
+    num_actuators_pupil = cached_get(dm_config_id, 'dm_length_actuators', int)
     sin_wave = np.zeros((num_actuators_pupil, num_actuators_pupil))
     if initial_data is not None:
         sin_wave += initial_data
@@ -45,11 +49,7 @@ def sin_command(sin_specification,
     for spec in sin_specification:
 
         # Make sure the requested command is properly sampled on the DM.
-        if spec.ncycles > 17:
-            raise ValueError("Cannot do more than 17 cycles per pupil on DM with 34 actuators across.")
-
-        elif spec.ncycles >= 17 and spec.phase < 90:    # We can only do phase=90 if ncycles=17
-            raise ValueError("Cosine (phase ~= 0) will not be sampled correctly at 17 cycles per pupil.")
+        __check_sampling(spec.ncycles, spec.phase)
 
         sin_wave += __sin_wave(spec.angle,
                                spec.ncycles,
@@ -109,23 +109,26 @@ def __sin_wave_aj_matlab(rotate_deg, ncycles, amplitude_factor):
     return sin_wave_v
 
 
-def __sin_wave(rotate_deg, ncycles, peak_to_valley, phase):
+def precompute_sin_basis(rotate_deg, ncycles):
     """
-    Mathematical function to create a 2D sine wave the size of the HiCAT pupil.
+    Evaluates the two quadrature components of a 2D sine wave on the DM grid. The expensive trig and grid sampling only
+    depends on the angle and frequency, so when sweeping phase and/or amplitude compute this once and pass the result
+    to assemble_sin().
     :param rotate_deg: Angle to rotate 2D sine wave in degrees.
     :param ncycles: Frequency in number of cycles.
-    :param peak_to_valley: Amplitude multiplier pint quantity with base units of meters.
-    :param phase: Phase in degrees. Note: phase = 0 produces a symmetrical cosine. phase = 90 produces a sine.
-    :return: 2D numpy array sized by the "dm_length_actuators" parameter in config.ini file.
+    :return: SinBasis of the 2D numpy arrays (cos_grid, sin_grid), sized by the "dm_length_actuators" parameter in
+             config.ini, and ncycles.
     """
 
+    # Make sure the requested command is properly sampled on the DM.
+    __check_sampling(ncycles)
+
     # Make a linear ramp.
-    num_actuators_pupil = CONFIG_INI.getint(dm_config_id, 'dm_length_actuators')
+    num_actuators_pupil = cached_get(dm_config_id, 'dm_length_actuators', int)
     linear_ramp = np.linspace(-0.5, 0.5, num=num_actuators_pupil, endpoint=False)
     linear_ramp += 0.5/num_actuators_pupil
 
     # Convert to radians.
-    phase_rad = np.deg2rad(phase)
     theta_rad = np.deg2rad(rotate_deg)
 
     # Create a 2D ramp.
@@ -136,5 +139,62 @@ def __sin_wave(rotate_deg, ncycles, peak_to_valley, phase):
     yt = y_mesh * np.sin(theta_rad)
     xyt = xt + yt
     xyf = xyt * float(ncycles) * 2.0 * np.pi
-    sine_wave = (float(peak_to_valley.to_base_units().m) / 2.0) * np.cos(xyf + phase_rad)
-    return sine_wave
+    return SinBasis(np.cos(xyf), np.sin(xyf), ncycles)
+
+
+def assemble_sin(sin_basis, peak_to_valley, phase, initial_data=None):
+    """
+    Combines a precomputed sine basis into a 2D sine wave of the given amplitude and phase, with the DM pupil mask
+    applied. Equivalent to ``sin_command(...).data`` for a single SinSpecification with the same angle and ncycles.
+
+    peak_to_valley and phase may also be 1D arrays (of the same length or broadcastable against each other), in which
+    case the result is a stack of K sine waves, shaped (K, N, N), computed in a single vectorized operation. This is
+    much faster than calling sin_command() per value when sweeping phase or amplitude.
+    :param sin_basis: SinBasis as returned by precompute_sin_basis().
+    :param peak_to_valley: Amplitude multiplier pint quantity with base units of meters.
+    :param phase: Phase in degrees. Note: phase = 0 produces a symmetrical cosine. phase = 90 produces a sine.
+    :param initial_data: Pass in numpy array to start with, the sine wave(s) will be added to it.
+    :return: 2D numpy array, or 3D numpy array if either peak_to_valley or phase are arrays.
+    """
+    # Make sure the requested command is properly sampled on the DM, as sin_command() does.
+    __check_sampling(sin_basis.ncycles, phase)
+
+    sin_wave = __combine_sin_basis(sin_basis, peak_to_valley, phase)
+    if initial_data is not None:
+        sin_wave += initial_data
+
+    # Apply the DM pupil mask.
+    sin_wave *= catkit.util.get_dm_mask()
+    return sin_wave
+
+
+def __check_sampling(ncycles, phase=None):
+    if ncycles > 17:
+        raise ValueError("Cannot do more than 17 cycles per pupil on DM with 34 actuators across.")
+
+    elif ncycles >= 17 and phase is not None and np.any(np.asarray(phase) < 90):  # We can only do phase=90 if ncycles=17
+        raise ValueError("Cosine (phase ~= 0) will not be sampled correctly at 17 cycles per pupil.")
+
+
+def __combine_sin_basis(sin_basis, peak_to_valley, phase):
+    # cos(xyf + phase) = cos(xyf)cos(phase) - sin(xyf)sin(phase)
+    cos_grid, sin_grid = sin_basis.cos_grid, sin_basis.sin_grid
+    phase_rad = np.deg2rad(np.asarray(phase, dtype=float))
+    amplitude = np.asarray(peak_to_valley.to_base_units().m, dtype=float) / 2.0
+
+    # Trailing axes broadcast scalars to (1, 1) and 1D arrays to (K, 1, 1) against the (N, N) grids.
+    cos_coeff = (amplitude * np.cos(phase_rad))[..., np.newaxis, np.newaxis]
+    sin_coeff = (amplitude * np.sin(phase_rad))[..., np.newaxis, np.newaxis]
+    return cos_coeff * cos_grid - sin_coeff * sin_grid
+
+
+def __sin_wave(rotate_deg, ncycles, peak_to_valley, phase):
+    """
+    Mathematical function to create a 2D sine wave the size of the HiCAT pupil.
+    :param rotate_deg: Angle to rotate 2D sine wave in degrees.
+    :param ncycles: Frequency in number of cycles.
+    :param peak_to_valley: Amplitude multiplier pint quantity with base units of meters.
+    :param phase: Phase in degrees. Note: phase = 0 produces a symmetrical cosine. phase = 90 produces a sine.
+    :return: 2D numpy array sized by the "dm_length_actuators" parameter in config.ini file.
+    """
+    return __combine_sin_basis(precompute_sin_basis(rotate_deg, ncycles), peak_to_valley, phase)
@@ -2,7 +2,8 @@ import multiprocess.connection
 import os
 import socket
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 
 from catkit.interfaces.DeformableMirrorController import DeformableMirrorController
@@ -280,10 +281,14 @@ class DigitalMicroMirrorDevice(DeformableMirrorController):
         # No shape input means we plot out the current DMD shape.
         shape = shape if shape is not None else self.current_dmd_shape
         
-        plt.clf()
-        plt.imshow(shape, vmin=0, vmax=1)
-        plt.colorbar()
-        plt.savefig(os.path.join(self.dmd_data_path, f'{plot_name}.png'))
+        # Draw on a standalone Agg figure, rather than through pyplot, so that no GUI backend or global figure state is
+        # involved and nothing is left open between updates.
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        image = ax.imshow(shape, vmin=0, vmax=1)
+        fig.colorbar(image)
+        fig.savefig(os.path.join(self.dmd_data_path, f'{plot_name}.png'))
     
     def _build_message(self, data_length=2, command_type=0, row=0, column=0, data=None):
         """Function to build messages for the DMD controller. 
@@ -94,11 +94,11 @@ class IrisAoDmController(DeformableMirrorController):
         # In which case, the below readline() will deadlock! See https://github.com/spacetelescope/catkit/pull/189.
 
         # Read response.
-        self.log.info(f"{self.config_id}: Waiting for response...")
+        self.log.info("%s: Waiting for response...", self.config_id)
         resp = self.instrument.stdout.readline().decode()
         if "success" not in resp.lower():
             raise RuntimeError(f"{self.config_id} error: {resp}")
-        self.log.info(f"{self.config_id}: {resp}")
+        self.log.info("%s: %s", self.config_id, resp)
 
     def send_data(self, data):
         """
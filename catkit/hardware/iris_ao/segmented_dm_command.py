@@ -12,8 +12,8 @@ This module can be used to create a command in the following way:
     dm_object.apply_shape(command)
 
 Note that a command can be initialized from zeros, None, a list of tuples giving (P,T,T) for each segment,
-an .ini file, or a .PTT### file. The PoppySegmentedDmCommand class can be used to create a command from
-input Zernike coefficients.
+an array of shape (number of segments, 3), an .ini file, or a .PTT### file. The PoppySegmentedDmCommand
+class can be used to create a command from input Zernike coefficients.
 Additionally, a single segment can be changed using the SegmentedDmCommand.update_one_segment()
 method.
 
@@ -270,10 +270,10 @@ class SegmentedDmCommand(object):
         """
         ptt_list, segment_names = util.read_segment_values(segment_values, self.dm_config_id)
         if segment_names is not None:
-            command_list = []
-            for seg_name in self.segments_in_pupil:  # Pull out only segments in the pupil
-                ind = np.where(np.asarray(segment_names) == seg_name)[0][0]
-                command_list.append(ptt_list[ind])
+            # Index the segment names once rather than searching them for every segment in the pupil.
+            segment_index = {seg_name: ind for ind, seg_name in enumerate(segment_names)}
+            # Pull out only segments in the pupil
+            command_list = [ptt_list[segment_index[seg_name]] for seg_name in self.segments_in_pupil]
         else:
             command_list = ptt_list
         return command_list
@@ -414,7 +414,7 @@ class SegmentedDmCommand(object):
         Get the deployed mirror state (wavefront error)
         To make plot:
         total_iris = iris_ao.HicatSegmentedDmCommand()
-        total_iris.read_initial_command([tuple(row) for row in command_to_plot])
+        total_iris.read_initial_command(command_to_plot)
         total_iris.apply_current_wavefront()
         command = total_iris.aperture.sample(what='opd') 
         image = ax.matshow(command)
@@ -539,9 +539,12 @@ def convert_ptt_units(ptt_list, tip_factor, tilt_factor, starting_units, ending_
     :return: list of tuples of the piston, tip, tilt values for each segment listed,
              in the respective ending_units
     """
-    converted = [(ptt[0]*(starting_units[0]).to(ending_units[0]),
-                  tip_factor*ptt[2]*(starting_units[2]).to(ending_units[2]),
-                  tilt_factor*ptt[1]*(starting_units[1]).to(ending_units[1])) for ptt in ptt_list]
+    # Unit conversions are invariant across segments; compute the scale factors once.
+    piston_scale = (starting_units[0]).to(ending_units[0])
+    tip_scale = tip_factor*(starting_units[2]).to(ending_units[2])
+    tilt_scale = tilt_factor*(starting_units[1]).to(ending_units[1])
+
+    converted = [(ptt[0]*piston_scale, ptt[2]*tip_scale, ptt[1]*tilt_scale) for ptt in ptt_list]
     return converted
 
 
@@ -319,10 +319,11 @@ def read_segment_values(segment_values=None, dm_config_id=None):
     - .PTT111/.PTT489 file: File format of the segments values coming out of the IrisAO GUI
     - .ini file: File format of segments values that gets sent to the IrisAO controls
     - list of tuples: Same format that gets returned: [(piston, tip, tilt), ]
+    - array of shape (number of segments, 3): One (piston, tip, tilt) row per segment
 
-    :param segment_values: str, list. Can be .PTT111, .ini files or a list with piston, tip,
-                           tilt values in a tuple for each segment. For the list, the first
-                           element is the center or top of the innermost ring of the pupil,
+    :param segment_values: str, list, array. Can be .PTT111, .ini files, a list with piston, tip,
+                           tilt values in a tuple for each segment, or an equivalent array. For the
+                           list or array, the first element is the center or top of the innermost ring of the pupil,
                            and subsequent elements continue up and/or clockwise around the
                            pupil (see README for more information)
     :param dm_config_id: str,
@@ -350,6 +351,11 @@ def read_segment_values(segment_values=None, dm_config_id=None):
     elif isinstance(segment_values, list):
         ptt_list = segment_values
         segment_names = None
+    elif isinstance(segment_values, np.ndarray):
+        if segment_values.ndim != 2 or segment_values.shape[1] != 3:
+            raise ValueError("Segment values given as an array must have a shape of (number of segments, 3)")
+        ptt_list = [tuple(ptt) for ptt in segment_values.tolist()]
+        segment_names = None
     else:
         raise TypeError("The segment values input format is not supported")
 
@@ -77,7 +77,7 @@ class NewportMotorController(MotorController):
         current_position = self.get_position(motor_id)
         if not np.isclose(current_position, position, atol=self.atol):
             # Move.
-            self.log.info(f"Moving positioner '{positioner}' by '{position}'...")
+            self.log.info("Moving positioner '%s' by '%s'...", positioner, position)
             error_code, return_string = self.instrument.GroupMoveAbsolute(self.socket_id, positioner, [position])
             self.__raise_on_error(error_code, 'GroupMoveAbsolute')
 
@@ -92,7 +92,7 @@ class NewportMotorController(MotorController):
         self.__ensure_initialized(group)
 
         # Move.
-        self.log.info(f"Moving positioner '{positioner}' by '{distance}'...")
+        self.log.info("Moving positioner '%s' by '%s'...", positioner, distance)
         error_code, return_string = self.instrument.GroupMoveRelative(self.socket_id, positioner, [distance])
         self.__raise_on_error(error_code, 'GroupMoveRelative')
 
@@ -118,7 +118,7 @@ class NewportMotorController(MotorController):
         if current_status not in self.OK_STATES:
             error_code, return_string = self.instrument.GroupKill(self.socket_id, group)
             self.__raise_on_error(error_code, 'GroupKill')
-            self.log.warning(f"Killed group '{group}' because it was not in state '{self.OK_STATES}'")
+            self.log.warning("Killed group '%s' because it was not in state '%s'", group, self.OK_STATES)
 
             # Update the status.
             error_code, current_status = self.instrument.GroupStatusGet(self.socket_id, group)
@@ -129,7 +129,7 @@ class NewportMotorController(MotorController):
             # Initialize the group
             error_code, return_string = self.instrument.GroupInitialize(self.socket_id, group)
             self.__raise_on_error(error_code, 'GroupInitialize')
-            self.log.info(f"Initialized group '{group}'")
+            self.log.info("Initialized group '%s'", group)
 
             # Update the status
             error_code, current_status = self.instrument.GroupStatusGet(self.socket_id, group)
@@ -139,7 +139,7 @@ class NewportMotorController(MotorController):
         if current_status == 42:
             error_code, return_string = self.instrument.GroupHomeSearch(self.socket_id, group)
             self.__raise_on_error(error_code, 'GroupHomeSearch')
-            self.log.info(f"Homed group '{group}'")
+            self.log.info("Homed group '%s'", group)
 
     def __move_to_nominal(self, group_config_id):
         self.__ensure_initialized(CONFIG_INI.get(group_config_id, "group_name"))
@@ -189,7 +189,7 @@ class NewportPicomotorController(MotorController2):
             self.log.error(error_msg)
             raise RuntimeError(error_msg)
          
-        self.log.info(f'Command sent. Action : {cmd_key}. Axis : {axis}. Value : {value}')
+        self.log.info('Command sent. Action : %s. Axis : %s. Value : %s', cmd_key, axis, value)
 
     @http_except
     def get_status(self, axis):
@@ -213,7 +213,7 @@ class NewportPicomotorController(MotorController2):
             message = self._build_message(cmd_key, 'get', axis)
             value = self._send_message(message, 'get') 
             state_dict[f'{cmd_key}_{axis}'] = value
-            self.log.info(f'For axis {axis}, {cmd_key} is set to {value}')
+            self.log.info('For axis %s, %s is set to %s', axis, cmd_key, value)
         
         return state_dict
         
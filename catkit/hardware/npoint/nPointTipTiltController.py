@@ -107,7 +107,7 @@ class NPointLC400(ClosedLoopController):
         """ Read a response from controller. """
         start = time.time()
         resp = self.instrument.read_bytes(byte_count)
-        self.log.debug(f'It took {start - time.time()}s to read response.')
+        self.log.debug('It took %ss to read response.', start - time.time())
         return resp
 
     def _send(self, message):
@@ -195,14 +195,14 @@ class NPointLC400(ClosedLoopController):
         set_value = self.get(parameter, channel)
         if value != set_value:
             raise ValueError(f'Command was NOT successful : {value} != {set_value}.')  # RT error?
-        self.log.debug(f'Command successful: {value} == {set_value}.')
+        self.log.debug('Command successful: %s == %s.', value, set_value)
         
     def get_status(self, channel):
         """ Get the value of all parameter: loop, and p/i/d_gain for the specified channel. Returns a dict. """
         value_dict = {}
         for parameter in Parameters:
             value_dict[parameter] = self.get(parameter, channel)
-        self.log.info(f"Status: {value_dict}")
+        self.log.info("Status: %s", value_dict)
         return value_dict 
 
     def set_closed_loop(self, active=True):
@@ -7,11 +7,14 @@
 
 import ctypes
 import enum
-import math
+import functools
 import os
 import platform
 import sys
+import threading
+import time
 
+from catkit.config import CONFIG_INI
 from catkit.interfaces.Instrument import Instrument
 import catkit.util
 
@@ -21,29 +24,82 @@ class Unit(enum.Enum):
     REAL = 2
 
 
+class LatencyMode(enum.Enum):
+    """
+    Presets for how Stage.await_stop() polls, trading latency for controller traffic and how long to wait on a stage
+    that never stops (e.g., it's broken).
+    Values are (mode_name, poll_interval, max_poll_interval, timeout) with all times in seconds.
+    """
+    LOW = ("low", 0.001, 0.05, 10*60)
+    BALANCED = ("balanced", 0.01, 0.2, 10*60)
+    SAFE = ("safe", 0.1, 1, 60)
+
+    def __init__(self, mode_name, poll_interval, max_poll_interval, timeout):
+        self.mode_name = mode_name
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+    @classmethod
+    def _missing_(cls, value):
+        for item in cls:
+            if isinstance(value, str) and value.lower() in (item.mode_name, item.name.lower()):
+                return item
+
+
+def _split_q8(x):
+    """ Split x into whole steps and 1/256 microsteps, e.g., 2.5 -> (2, 128), -2.5 -> (-2, -128).
+
+        Rounds to the nearest microstep rather than truncating such that, e.g., 0.99999999 -> (1, 0) and not (0, 255).
+        Both parts carry the sign of x, matching math.modf().
+    """
+    q = int(round(x * 256))
+    whole, micro = divmod(abs(q), 256)
+    return (-whole, -micro) if q < 0 else (whole, micro)
+
+
 # https://files.xisupport.com/Software.en.html
-try:
-    ximc_dir = "C:/Users/stuf/Desktop/stuf installs/ximc-2.13.3/ximc/"
-    library_path = os.path.join(ximc_dir, "crossplatform/wrappers/python/") #os.environ.get('CATKIT_PYXIMC_LIB_PATH')
-    if library_path:
-        sys.path.append(library_path)
-
-    # Depending on your version of Windows, add the path to the required DLLs to the environment variable
-    # bindy.dll
-    # libximc.dll
-    # xiwrapper.dll
-    if platform.system() == "Windows":
-        # Determining the directory with dependencies for windows depending on the bit depth.
-        arch_dir = "win64" if "64" in platform.architecture()[0] else "win32"  #
-        libdir = os.path.join(ximc_dir, arch_dir)
-        if sys.version_info >= (3, 8):
-            os.add_dll_directory(libdir)
-        else:
-            os.environ["Path"] = libdir + ";" + os.environ["Path"]  # add dll path into an environment variable
+@functools.lru_cache(maxsize=1)
+def _get_pyximc():
+    """ Import pyximc on first use rather than at module import, as this requires adding the ximc DLLs to the search
+        path which is slow and unnecessary for anything not actually using a stage.
+
+        :return: The pyximc module, or the exception raised whilst importing it.
+    """
+    try:
+        ximc_dir = "C:/Users/stuf/Desktop/stuf installs/ximc-2.13.3/ximc/"
+        library_path = os.path.join(ximc_dir, "crossplatform/wrappers/python/") #os.environ.get('CATKIT_PYXIMC_LIB_PATH')
+        if library_path:
+            sys.path.append(library_path)
+
+        # Depending on your version of Windows, add the path to the required DLLs to the environment variable
+        # bindy.dll
+        # libximc.dll
+        # xiwrapper.dll
+        if platform.system() == "Windows":
+            # Determining the directory with dependencies for windows depending on the bit depth.
+            arch_dir = "win64" if "64" in platform.architecture()[0] else "win32"  #
+            libdir = os.path.join(ximc_dir, arch_dir)
+            if sys.version_info >= (3, 8):
+                os.add_dll_directory(libdir)
+            else:
+                os.environ["Path"] = libdir + ";" + os.environ["Path"]  # add dll path into an environment variable
+
+        import pyximc  # noqa: E402
+    except Exception as error:
+        return error
+
+    return pyximc
+
+
+class _LazyPyximc:
+    """ Resolves to _get_pyximc() for both class and instance access, e.g., ``Stage.instrument_lib``.
+
+        This is a non-data descriptor such that it can still be overridden, e.g., by emulators.
+    """
+    def __get__(self, obj, objtype=None):
+        return _get_pyximc()
 
-    import pyximc  # noqa: E402
-except Exception as error:
-    pyximc = error
 
 # cur_dir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 # os.chdir(cur_dir)
@@ -55,22 +111,87 @@ except Exception as error:
 
 class Stage(Instrument):
 
-    instrument_lib = pyximc
+    instrument_lib = _LazyPyximc()
+
+    # Consecutive position reads within this many seconds are served from the last get_position() call.
+    POSITION_MAX_AGE = 0.002
+
+    # The controller can take ~1ms to report a just issued move in MvCmdSts, so for this many seconds after issuing one
+    # the stage is assumed to be moving without querying it.
+    MOVE_STATUS_DELAY = 0.002
 
-    def initialize(self, device_name, softStops, homeOffset, conversionFactor, units):
+    # Probing USB for devices is slow, so the device list is cached for all stages for this many seconds.
+    DEVICE_ENUMERATION_MAX_AGE = 30.0
+    _enum_cache = None
+    _enum_cache_ts = 0.0
+    _enum_lock = threading.Lock()
+
+    def initialize(self, device_name, softStops, homeOffset, conversionFactor, units, latency_mode=None,
+                   poll_interval=None, stop_timeout=None):
+        """
+        :param latency_mode: LatencyMode, str (optional) - Preset for await_stop() polling. Read from "latency_mode" in
+                             the config section for config_id if None, defaulting to LatencyMode.LOW.
+        :param poll_interval: float (optional) - Initial await_stop() poll interval (s), overrides latency_mode. Read
+                              from "poll_interval_s" in the config section for config_id if None.
+        :param stop_timeout: float (optional) - Default await_stop() timeout (s), overrides latency_mode. Read from
+                             "stop_timeout_s" in the config section for config_id if None.
+        """
         if isinstance(self.instrument_lib, Exception):
             raise self.instrument_lib
 
         self.device_name = device_name
         self.softStops = softStops
-        self.u_homeOffset, self.homeOffset = math.modf(homeOffset)
+        self.homeOffset, self.u_homeOffset = _split_q8(homeOffset)
         self.conversionFactor = conversionFactor
         self.units = units
 
         self.deviceID = self.get_device_id(self.device_name)
 
+        # Read these once here rather than on every call to await_stop().
+        self.latency_mode = LatencyMode(latency_mode if latency_mode is not None else
+                                        self._get_config("latency_mode", LatencyMode.LOW.mode_name))
+        self.poll_interval = poll_interval if poll_interval is not None else \
+            self._get_config("poll_interval_s", self.latency_mode.poll_interval, cast=float)
+        self.max_poll_interval = max(self.latency_mode.max_poll_interval, self.poll_interval)
+        self.stop_timeout = stop_timeout if stop_timeout is not None else \
+            self._get_config("stop_timeout_s", self.latency_mode.timeout, cast=float)
+
+        # Allocate the ctypes structs once and reuse them for every call rather than creating new ones each time,
+        # e.g., is_moving() is called on every poll of await_stop().
+        # NOTE: Like all instruments, methods aren't mutexed server-side (see catkit.multiprocessing.MutexedNamespace)
+        # so a Stage instance should only be driven from a single thread.
+        self._pos_buf = self.instrument_lib.get_position_t()
+        self._status_buf = self.instrument_lib.status_t()
+        self._mvst_buf = self.instrument_lib.move_settings_t()
+        self._hmst_buf = self.instrument_lib.home_settings_t()
+        self._pos_ts = float("-inf")
+        self._move_ts = float("-inf")
+        self._known_stopped = False
+
+    def _get_config(self, key, fallback, cast=str):
+        # Stages can be used without any config loaded, in which case everything is left as the default.
+        if CONFIG_INI.self is None:
+            return fallback
+        value = CONFIG_INI.get(self.config_id, key, fallback=None)
+        return fallback if value is None else cast(value)
+
     def _open(self):
-        return self.instrument_lib.lib.open_device(self.deviceID)
+        # Nothing is known about the state of a newly opened device.
+        self._known_stopped = False
+        self._invalidate_position()
+
+        device = self.instrument_lib.lib.open_device(self.deviceID)
+
+        if getattr(device, "value", device) < 0:
+            # The cached device list may be stale, e.g., if the device was reconnected, so re-scan and retry once.
+            self.invalidate_device_cache()
+            self.deviceID = self.get_device_id(self.device_name)
+            device = self.instrument_lib.lib.open_device(self.deviceID)
+
+            if getattr(device, "value", device) < 0:
+                raise RuntimeError(f"Failed to open '{self.device_name}' with ID '{self.deviceID}'.")
+
+        return device
 
     def _close(self):
         self.instrument_lib.lib.close_device(ctypes.byref(self.instrument))
@@ -100,6 +221,7 @@ class Stage(Instrument):
 
         self.set_home_settings(hmst)
 
+        self._mark_moving()
         result = self.instrument_lib.lib.command_homezero(self.instrument)
 
         if result != self.instrument_lib.Result.Ok:
@@ -122,8 +244,9 @@ class Stage(Instrument):
             raise RuntimeError("set_home_settings() failed")
 
     def get_home_settings(self):
-        hmst = self.instrument_lib.home_settings_t()
-        
+        """ NOTE: The returned struct is reused by subsequent calls. """
+        hmst = self._hmst_buf
+
         result = self.instrument_lib.lib.get_home_settings(self.instrument, ctypes.byref(hmst))
         
         if result != self.instrument_lib.Result.Ok:
@@ -143,13 +266,11 @@ class Stage(Instrument):
         :param position: int, float - Position to go to (In steps as a decimal).
         """
 
-        # split the integer from the decimal
-        u_pos, pos = math.modf(position)
+        # Split the integer from the decimal, converting the decimal to #/256.
+        pos, u_pos = _split_q8(position)
 
-        # convert the decimal to #/256
-        u_pos = u_pos * 256
-
-        result = self.instrument_lib.lib.command_move(self.instrument, int(pos), int(u_pos))
+        self._mark_moving()
+        result = self.instrument_lib.lib.command_move(self.instrument, pos, u_pos)
         if result != self.instrument_lib.Result.Ok:
             raise RuntimeError("command_move() failed")
 
@@ -168,7 +289,7 @@ class Stage(Instrument):
         :param position: int, float (In steps as a decimal).
         """
         position = position / self.conversionFactor
-        self.log.info(f'goto_steps: {position}')
+        self.log.info('goto_steps: %s', position)
         return self.goto_steps(position, wait=wait)
 
     def absolute_move(self, position, wait=True, units=Unit.STEPS):
@@ -187,6 +308,25 @@ class Stage(Instrument):
         else:
             raise NotImplementedError()
 
+    def queue_move(self, position, units=Unit.STEPS):
+        """
+        Sends a move command without waiting for it to complete, such that the caller can do other work whilst the
+        stage is in motion.
+
+        A new ximc move command overrides any move still in progress, so this first waits for the prior move (if any)
+        to stop. I.e., the wait is moved from the end of each move to the start of the next. Call drain() to wait for
+        the last queued move.
+
+        :param position: int, float - Position to go to (in the given units).
+        :param units: Unit - Whether position is given in steps or real units.
+        """
+        self.drain()
+        return self.absolute_move(position, wait=False, units=units)
+
+    def drain(self, **kwargs):
+        """ Wait for any move issued by queue_move() to complete. See await_stop() for kwargs. """
+        return self.await_stop(**kwargs)
+
     def set_speed(self, speed):
         """
         Sets the speed in steps/s.
@@ -194,21 +334,18 @@ class Stage(Instrument):
         :param speed: int - Speed (as a decimal) in steps/s
         """
 
-        mvst = self.instrument_lib.move_settings_t()
+        mvst = self._mvst_buf
         result = self.instrument_lib.lib.get_move_settings(self.instrument, ctypes.byref(mvst))
 
         if result != self.instrument_lib.Result.Ok:
             raise RuntimeError("get_move_settings() failed")
 
-        # split the integer from the decimal
-        u_speed, speed = math.modf(speed)
-
-        # convert the decimal to #/256
-        u_speed = u_speed * 256
+        # Split the integer from the decimal, converting the decimal to #/256.
+        speed, u_speed = _split_q8(speed)
 
         # prepare move_settings_t struct
-        mvst.Speed = int(speed)
-        mvst.uSpeed = int(u_speed)
+        mvst.Speed = speed
+        mvst.uSpeed = u_speed
         result = self.instrument_lib.lib.set_move_settings(self.instrument, ctypes.byref(mvst))
         if result != self.instrument_lib.Result.Ok:
             raise RuntimeError("set_move_settings() failed")
@@ -221,7 +358,7 @@ class Stage(Instrument):
         - mvst.Speed    Speed in steps
         - mvst.uSpeed   Leftover uSteps
         """
-        mvst = self.instrument_lib.move_settings_t()
+        mvst = self._mvst_buf
         result = self.instrument_lib.lib.get_move_settings(self.instrument, ctypes.byref(mvst))
 
         if result != self.instrument_lib.Result.Ok:
@@ -231,7 +368,10 @@ class Stage(Instrument):
 
     def is_moving(self):
         """ Returns the moving status of the given device. """
-        deviceStatus = self.instrument_lib.status_t()
+        if time.monotonic() - self._move_ts < self.MOVE_STATUS_DELAY:
+            return True
+
+        deviceStatus = self._status_buf
         result = self.instrument_lib.lib.get_status(self.instrument, ctypes.byref(deviceStatus))
 
         if result != self.instrument_lib.Result.Ok:
@@ -239,7 +379,40 @@ class Stage(Instrument):
 
         moveComState = deviceStatus.MvCmdSts
 
-        return moveComState == 129
+        # The position may have changed since it was last read, even if it's now stopped.
+        self._invalidate_position()
+
+        moving = moveComState == 129
+        if not moving:
+            self._known_stopped = True
+        return moving
+
+    def _mark_moving(self):
+        """ Record that a motion command is being issued, see MOVE_STATUS_DELAY. """
+        self._invalidate_position()
+        self._move_ts = time.monotonic()
+        self._known_stopped = False
+
+    def _read_position(self):
+        """ Query the device position, reusing the last reading if it was taken within POSITION_MAX_AGE seconds.
+
+            get_step_position(), get_enc_position(), and get_position() all read from the same get_position() call
+            such that sampling all three costs a single round-trip.
+        """
+        now = time.monotonic()
+        if now - self._pos_ts < self.POSITION_MAX_AGE:
+            return self._pos_buf
+
+        result = self.instrument_lib.lib.get_position(self.instrument, ctypes.byref(self._pos_buf))
+
+        if result != self.instrument_lib.Result.Ok:
+            raise RuntimeError("get_position() failed")
+
+        self._pos_ts = now
+        return self._pos_buf
+
+    def _invalidate_position(self):
+        self._pos_ts = float("-inf")
 
     def get_step_position(self):
         """
@@ -247,11 +420,7 @@ class Stage(Instrument):
 
         :return: stagePosition Position of the stage
         """
-        stagePositionTmp = self.instrument_lib.get_position_t()
-        result = self.instrument_lib.lib.get_position(self.instrument, ctypes.byref(stagePositionTmp))
-
-        if result != self.instrument_lib.Result.Ok:
-            raise RuntimeError("get_position() failed")
+        stagePositionTmp = self._read_position()
 
         # Convert the position from steps to readable units (conversionFactor)
         stagePosition = stagePositionTmp.Position + (stagePositionTmp.uPosition / 256)
@@ -264,13 +433,7 @@ class Stage(Instrument):
 
         :return: stagePosition Position of the stage
         """
-        stagePositionTmp = self.instrument_lib.get_position_t()
-        result = self.instrument_lib.lib.get_position(self.instrument, ctypes.byref(stagePositionTmp))
-
-        if result != self.instrument_lib.Result.Ok:
-            raise RuntimeError("get_position() failed")
-
-        return stagePositionTmp.EncPosition
+        return self._read_position().EncPosition
 
     def get_position(self):
         """
@@ -281,26 +444,96 @@ class Stage(Instrument):
         return self.conversionFactor * self.get_enc_position()
 
     def stop(self):
+        self._invalidate_position()
+        self._known_stopped = False
         result = self.instrument_lib.lib.command_sstp(self.instrument)
         if result != self.instrument_lib.Result.Ok:
             raise RuntimeError("Soft stop failed")
 
-    def await_stop(self,  timeout=10*60, poll_interval=1):
+    def await_stop(self, timeout=None, poll_interval=None, backoff=1.5, max_poll_interval=None):
         """ Wait for device to indicate it has stopped moving.
 
-            See catkit.util.poll_status for API.
+            Has the same semantics as catkit.util.poll_status((False,), self.is_moving, ...), see it for API.
+
+            The poll interval starts small and grows by `backoff` up to `max_poll_interval` such that short moves
+            return promptly without a long move flooding the controller with status requests.
+
+            timeout, poll_interval, and max_poll_interval default to those set by latency_mode (or the config) when
+            the stage was initialized. When only poll_interval is given, max_poll_interval is never less than it.
 
-            NOTE: Default timeout is arbitrarily long.
+            NOTE: This returns immediately, without querying the device, if it has already been seen to have stopped
+            since the last move command issued from this instance.
         """
-        return catkit.util.poll_status((False,), self.is_moving, timeout=timeout, poll_interval=poll_interval)
+        if self._known_stopped:
+            return False
+
+        if poll_interval is None:
+            poll_interval = self.poll_interval
+        if max_poll_interval is None:
+            max_poll_interval = max(self.max_poll_interval, poll_interval)
+
+        return self._poll_until_stopped(timeout=self.stop_timeout if timeout is None else timeout,
+                                        poll_interval=poll_interval,
+                                        backoff=backoff,
+                                        max_poll_interval=max_poll_interval)
+
+    def _poll_until_stopped(self, timeout, poll_interval, backoff, max_poll_interval):
+        # Every attribute access on an Instrument acquires its mutex (see catkit.multiprocessing.MutexedNamespace), so
+        # bind everything needed up front such that each poll is just the ctypes call itself, rather than polling
+        # is_moving(). This keeps the GIL free for other threads whilst waiting.
+        get_status = self.instrument_lib.lib.get_status
+        ok = self.instrument_lib.Result.Ok
+        instrument = self.instrument
+        status = self._status_buf
+        status_ref = ctypes.byref(status)
+
+        def is_moving():
+            if get_status(instrument, status_ref) != ok:
+                raise RuntimeError("get_status() failed")
+            return status.MvCmdSts == 129
+
+        # Don't trust the status of a move that was only just issued, see MOVE_STATUS_DELAY.
+        settle_time = self._move_ts + self.MOVE_STATUS_DELAY - time.monotonic()
+        if settle_time > 0:
+            time.sleep(settle_time)
+
+        try:
+            moving = catkit.util.poll_status((False,), is_moving, timeout=timeout, poll_interval=poll_interval,
+                                             backoff=backoff, max_poll_interval=max_poll_interval)
+        finally:
+            # The stage has (most likely) moved whilst polling, so don't serve a position read from before.
+            self._invalidate_position()
+        self._known_stopped = True
+        return moving
 
     @classmethod
     def scan_for_devices(cls):
         """
-        Scans for motor controllers on USB
+        Scans for motor controllers on USB. Results are cached for DEVICE_ENUMERATION_MAX_AGE seconds, see
+        invalidate_device_cache().
 
         Returns the list of devices found
         """
+        with cls._enum_lock:
+            if cls._enum_cache and time.monotonic() - cls._enum_cache_ts < cls.DEVICE_ENUMERATION_MAX_AGE:
+                return list(cls._enum_cache)
+
+            devices_list = cls._enumerate_devices()
+
+            # Don't cache an empty list, the devices may just not be powered on yet.
+            if devices_list:
+                Stage._enum_cache = devices_list
+                Stage._enum_cache_ts = time.monotonic()
+
+            return list(devices_list)
+
+    @classmethod
+    def invalidate_device_cache(cls):
+        with cls._enum_lock:
+            Stage._enum_cache = None
+
+    @classmethod
+    def _enumerate_devices(cls):
         probe_flags = cls.instrument_lib.EnumerateFlags.ENUMERATE_PROBE
         devenum = cls.instrument_lib.lib.enumerate_devices(probe_flags, None)
         dev_count = cls.instrument_lib.lib.get_device_count(devenum)
@@ -95,11 +95,11 @@ class ThorlabsFW102C(FilterWheel):
 
         # Do nothing if already in desired position (unless ``force is True``).
         if not force and (position == self.current_position):
-            self.log.info(f"Filter wheel already at {position}")
+            self.log.info("Filter wheel already at %s", position)
             return
 
         # Move.
-        self.log.info(f"Configuring filter wheel to position: '{position}'...")
+        self.log.info("Configuring filter wheel to position: '%s'...", position)
         self.comm(f"{self.Commands.SET_POSITION.value}{position}")
         self.current_position = position
         # Wait for wheel to move. Fairly arbitrary 3s delay...
@@ -181,7 +181,7 @@ class ThorlabsMCLS1(LaserSource):
         :param channel: Integer value for channel (1 - 4)
         :param value: Integer, bool value, 1 is enabled, and 0 is disabled.
         """
-        self.log.info(f"Laser is enabling channel '{channel}'...")
+        self.log.info("Laser is enabling channel '%s'...", channel)
         self.set(self.Command.SET_ENABLE, value, channel=channel)
         if value:
             catkit.util.sleep(self.sleep_time)
@@ -69,7 +69,7 @@ class ThorlabsMFF101(FlipMotor):
 
         if not force and beam_position is not None and beam_position is self.current_position:
             # Already in desired position.
-            self.log.info(f"Not moving '{self.config_id}' as it's already '{beam_position}' (position='{position}').")
+            self.log.info("Not moving '%s' as it's already '%s' (position='%s').", self.config_id, beam_position, position)
             return
 
         if position == 1:
@@ -79,7 +79,7 @@ class ThorlabsMFF101(FlipMotor):
         else:
             raise NotImplementedError
 
-        self.log.info(f"Moving to '{beam_position}' (position='{position}')...")
+        self.log.info("Moving to '%s' (position='%s')...", beam_position, position)
         self.instrument.write(command.value)
         catkit.util.sleep(1)
         self.current_position = beam_position
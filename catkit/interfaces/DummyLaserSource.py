@@ -16,8 +16,8 @@ class DummyLaserSource(LaserSource):
         return self
 
     def set_current(self, value, sleep=True):
-        self.log.info(f"Dummy laser '{self.config_id}' set_current() being ignored.")
+        self.log.info("Dummy laser '%s' set_current() being ignored.", self.config_id)
 
     def get_current(self):
-        self.log.info(f"Dummy laser '{self.config_id}' get_current() returns None.")
+        self.log.info("Dummy laser '%s' get_current() returns None.", self.config_id)
         return None
@@ -0,0 +1,67 @@
+import configparser
+import os
+
+import pytest
+
+import catkit.config
+
+
+@pytest.fixture()
+def config_ini(tmpdir):
+    previous_config = catkit.config.CONFIG_INI.self
+
+    config_filename = os.path.join(tmpdir, "config.ini")
+    with open(config_filename, "w") as file:
+        file.write("[dummy]\nname = dummy\nlength = 34\nratio = 0.5\nenabled = false\n")
+    yield catkit.config.load_config_ini(config_filename)
+
+    catkit.config.CONFIG_INI.point_to(previous_config)
+
+
+def test_cached_get(config_ini):
+    assert catkit.config.cached_get("dummy", "name") == "dummy"
+    assert catkit.config.cached_get("dummy", "length", int) == 34
+    assert catkit.config.cached_get("dummy", "ratio", float) == 0.5
+    assert catkit.config.cached_get("dummy", "enabled", bool) is False
+
+    with pytest.raises(TypeError):
+        catkit.config.cached_get("dummy", "length", list)
+
+
+def test_cached_get_cleared_on_load(config_ini, tmpdir):
+    assert catkit.config.cached_get("dummy", "length", int) == 34
+
+    config_filename = os.path.join(tmpdir, "config_new.ini")
+    with open(config_filename, "w") as file:
+        file.write("[dummy]\nlength = 12\n")
+    catkit.config.load_config_ini(config_filename)
+
+    assert catkit.config.cached_get("dummy", "length", int) == 12
+
+
+def test_cached_get_follows_point_to(config_ini):
+    assert catkit.config.cached_get("dummy", "length", int) == 34
+
+    other_config = configparser.ConfigParser()
+    other_config.read_string("[dummy]\nlength = 56\n")
+    catkit.config.CONFIG_INI.point_to(other_config)
+    assert catkit.config.cached_get("dummy", "length", int) == 56
+
+    catkit.config.CONFIG_INI.point_to(config_ini)
+    assert catkit.config.cached_get("dummy", "length", int) == 34
+
+
+def test_config_cache():
+    calls = []
+
+    @catkit.config.config_cache()
+    def func(x):
+        calls.append(x)
+        return x
+
+    assert func(1) == func(1) == 1
+    assert calls == [1]
+
+    func.cache_clear()
+    func(1)
+    assert calls == [1, 1]
@@ -1,6 +1,8 @@
 import glob
 import math
 import os
+import time
+from unittest import mock
 
 import numpy as np
 import pytest
@@ -102,3 +104,30 @@ class TestSaveImages:
         assert(meta_data)
         assert(meta_data[0].name == "PATH")
         assert(os.path.isfile(meta_data[0].value))
+
+
+class TestPollStatus:
+
+    @staticmethod
+    def countdown(n):
+        counter = iter(range(n, -1, -1))
+        return lambda: next(counter) > 0
+
+    def test_break_state(self):
+        assert catkit.util.poll_status((False,), self.countdown(3), timeout=1) is False
+
+    def test_no_sleep_once_broken(self):
+        t0 = time.perf_counter()
+        catkit.util.poll_status((False,), self.countdown(0), timeout=10, poll_interval=5)
+        assert time.perf_counter() - t0 < 1
+
+    def test_backoff(self):
+        sleeps = []
+        with mock.patch("time.sleep", side_effect=sleeps.append):
+            catkit.util.poll_status((False,), self.countdown(5), timeout=10, poll_interval=0.01, backoff=2,
+                                    max_poll_interval=0.05)
+        assert sleeps == pytest.approx([0.01, 0.02, 0.04, 0.05, 0.05])
+
+    def test_timeout(self):
+        with pytest.raises(TimeoutError):
+            catkit.util.poll_status((False,), lambda: True, timeout=0.1, poll_interval=0.01)
@@ -38,6 +38,14 @@ def get_dm_mask():
     return get_dm_mask.mask
 
 
+def get_dm_mask_index():
+    """ Flat (C-order) indices of the actuators within the DM mask, cached so the mask is only scanned once. """
+    if not hasattr(get_dm_mask_index, 'index'):
+        get_dm_mask_index.index = np.flatnonzero(get_dm_mask())
+
+    return get_dm_mask_index.index
+
+
 # Does numpy gotchu?
 def safe_divide(a, b):
     """ ignore / 0, div0( [-1, 0, 1], 0 ) -> [0, 0, 0] """
@@ -195,7 +203,7 @@ def save_images(images, meta_data, path, base_filename, raw_skip=0):
                 hdu.header[entry.name_8chars[:8]] = (value, entry.comment)
 
         hdu.writeto(full_path, overwrite=True)
-        log.info(f"'{full_path}' written to disk.")
+        log.info("'%s' written to disk.", full_path)
 
 
 def str2bool(buffer):
@@ -276,12 +284,16 @@ def bit_set(data, bit, value=True):
         return data & ~mask
 
 
-def poll_status(break_states, func, timeout=60, poll_interval=0):
+def poll_status(break_states, func, timeout=60, poll_interval=0, backoff=1, max_poll_interval=None):
     """ Used to poll status whilst motor is in motion.
     This polls the device by calling `func` at intervals of self.QUERY_DELAY until `func() is in break_states`.
     :param break_states: iterable of states - Stop polling when func() returns a value matching that in break_states.
     :param func: callable - The function called to query the device status.
     :param timeout: int, float (optional) - Raise TimeoutError if break_states are not met within timeout seconds.
+    :param poll_interval: int, float (optional) - Seconds to sleep between calls to func().
+    :param backoff: int, float (optional) - Multiply poll_interval by this after each call to func(), i.e., short moves
+                    are caught early whilst long moves don't hammer the device.
+    :param max_poll_interval: int, float (optional) - Upper limit for poll_interval when backoff > 1.
     :returns: Returns the last value returned from func().
     """
 
@@ -293,14 +305,18 @@ def poll_status(break_states, func, timeout=60, poll_interval=0):
         t0 = time.perf_counter_ns()
         status = func()
 
+        if status in break_states:
+            break
+
         if poll_interval:
             time.sleep(poll_interval)
+            if backoff != 1:
+                poll_interval *= backoff
+                if max_poll_interval is not None:
+                    poll_interval = min(poll_interval, max_poll_interval)
 
         t = time.perf_counter_ns() - t0
 
-        if status in break_states:
-            break
-
         # NOTE: There's no need to sleep between iterations as there is already a query delay effectively doing the
         # same thing.
         if timeout_ns is not None and timeout_ns > 0: